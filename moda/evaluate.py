@@ -1,23 +1,24 @@
-import os
-import atexit
-import tempfile
+import hashlib
+import linecache
 
-from pathlib import Path
+from collections import OrderedDict
 from typing import Optional, Dict
 
+_evaluated_source_limit = 100
+_evaluated_file_names: 'OrderedDict[str, None]' = OrderedDict()
+
 def evaluate(code: str, path: Optional[str]='', context: Optional[Dict[str, any]]=None, repair_user: Optional['UserInteractor']=None):
   # TODO: Implement path and repair options
   assert path == '', 'Only the empty string path option is currently supported'
   assert repair_user is None, 'Only passing None for the repair_user option is currently supported'
   if context is None:
     context = {}
-  file, path = tempfile.mkstemp(suffix='.py')
-  os.close(file)
-  exit_handler = atexit.register(lambda: Path(path).unlink())
-  with open(path, mode='w+') as f:
-    f.write(code)
-    compiled = compile(code, path, 'exec')
-    exec(compiled, context, context)
-  atexit.unregister(exit_handler)
-  exit_handler()
+  file_name = f'<moda-eval-{hashlib.blake2b(code.encode(), digest_size=8).hexdigest()}>'
+  linecache.cache[file_name] = (len(code), None, code.splitlines(True), file_name)
+  _evaluated_file_names[file_name] = None
+  _evaluated_file_names.move_to_end(file_name)
+  while len(_evaluated_file_names) > _evaluated_source_limit:
+    linecache.cache.pop(_evaluated_file_names.popitem(last=False)[0], None)
+  compiled = compile(code, file_name, 'exec')
+  exec(compiled, context, context)
   return context
\ No newline at end of file
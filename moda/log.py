@@ -1,10 +1,12 @@
+import gc
 import os
+import atexit
 import psutil
+import tracemalloc
 import pandas as pd
 
 from datetime import datetime
-from pympler import muppy, summary
-from typing import Callable
+from typing import Callable, Optional, TextIO, Tuple
 
 def default_message_loggger(message: str, end: str='\n'):
   print(message, end=end)
@@ -18,17 +20,43 @@ def set_message_logger(message_logger: Callable[[str, str], None]):
 def log(message: str, end: str='\n'):
   log_message(message=message, end=end)
 
-def log_memory_usage(context: str=''):
-  process = psutil.Process(os.getpid())
-  memory = process.memory_info().rss
-  time_format = '%Y-%m-%dT%h:%m:%s'
+_process: Optional[Tuple[int, psutil.Process]] = None
+_memory_log_file: Optional[TextIO] = None
+
+def current_process() -> psutil.Process:
+  """Returns a cached psutil process for the current pid, rebuilding it after a fork."""
+  global _process
+  pid = os.getpid()
+  if _process is None or _process[0] != pid:
+    _process = (pid, psutil.Process(pid))
+  return _process[1]
+
+def memory_log_file() -> TextIO:
+  """Opens the memory log once, resolving its path against the working directory at the time, and closes it at exit."""
+  global _memory_log_file
+  if _memory_log_file is None:
+    directory = os.path.abspath(os.path.join('output', 'test'))
+    os.makedirs(directory, exist_ok=True)
+    _memory_log_file = open(os.path.join(directory, 'memory.txt'), 'a', buffering=1)
+    atexit.register(_memory_log_file.close)
+  return _memory_log_file
+
+def log_memory_usage(context: str='', verbose: bool=False):
+  """Logs process memory, the largest traced allocations, and DataFrames.
+
+  Traced allocations are only reported when tracemalloc is already tracing, for example under `python -X tracemalloc`, since tracing slows down every allocation. The columns and row count of each DataFrame are only printed when verbose is set.
+  """
+  memory = current_process().memory_info().rss
   print(f'Process memory {memory:,}')
-  with open(os.path.join('output', 'test', 'memory.txt'), 'a') as file:
-    file.write(f'{memory:,},{context},{datetime.now().strftime(time_format)}\n')
-  all_objects = muppy.get_objects()
-  sum1 = summary.summarize(all_objects)
-  summary.print_(sum1)
-  dataframes = [ao for ao in all_objects if isinstance(ao, pd.DataFrame)]
-  for d in dataframes:
-    print(d.columns.values)
-    print(f'Rows: {len(d)}')
+  memory_log_file().write(f'{memory},{context},{datetime.now().isoformat()}\n')
+  if tracemalloc.is_tracing():
+    snapshot = tracemalloc.take_snapshot()
+    for statistic in snapshot.statistics('lineno')[:20]:
+      print(statistic)
+  dataframes = [o for o in gc.get_objects() if isinstance(o, pd.DataFrame)]
+  if verbose:
+    for d in dataframes:
+      print(d.columns.values)
+      print(f'Rows: {len(d)}')
+  else:
+    print(f'DataFrames: {len(dataframes)} total, {sum(map(len, dataframes))} rows')
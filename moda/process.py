@@ -1,11 +1,13 @@
+import io
+import os
+import re
 import sys
-import time
+import codecs
 import shlex
 import atexit
+import selectors
 import subprocess
 
-from queue import Queue, Empty
-from threading import Thread
 from typing import List, Tuple, Callable, Optional, Generator, Union
 from .log import log
 
@@ -31,24 +33,20 @@ def escape_run_arg(run_arg: any) -> str:
   """Quotes a shell argument."""
   return shlex.quote(str(run_arg))
 
-def escape_run_args(run_args: List[str]) -> List[str]:
-  """Quotes shell arguments."""
-  # TODO: use shlex.join after upgrading to Python 3.8:
-  # return shlex.quote(shlex.join(run_args))
-  return [escape_run_arg(a) for a in run_args]
+def escape_run_args(run_args: List[str]) -> str:
+  """Quotes shell arguments and joins them into a command string."""
+  return shlex.join(map(str, run_args))
 
 def escape_command(run_args: List[str]) -> str:
   """Quotes a shell command so that it can be used as a run argument."""
-  # TODO: use shlex.join after upgrading to Python 3.8:
-  # return shlex.quote(shlex.join(run_args))
-  return shlex.quote(' '.join(escape_run_args(run_args=run_args)))
+  return shlex.quote(escape_run_args(run_args=run_args))
 
 def ssh_command(run_args: List[str], user: str, host: str, escape_run_args: bool=True) -> List[str]:
   """Wraps a command in an SSH command to run it on a remote host."""
   return [
     'ssh',
     f'{user}@{host}',
-    ' '.join(escape_run_arg(a) if escape_run_args else a for a in run_args),
+    shlex.join(map(str, run_args)) if escape_run_args else ' '.join(run_args),
   ]
 
 def script_command(script: str, shell: str='bash', should_eval: bool=False) -> List[str]:
@@ -68,45 +66,17 @@ def call_process(run_args: List[str], shell=False) -> int:
   return_code = subprocess.call(args=run_args, shell=shell)
   return return_code
 
-def read_stream(stream: any, chunk_size: int=1024, empty_sleep: float=0.01) -> Tuple[Queue, Queue, Thread]:
-  """Reads one byte at a time from a stream on a separate thread.
-
-  Returns:
-    tuple: a tuple containing a queue to receive output from the reader, a queue to send a stop signal to the readier, and the thread on which the reader runs.
-  """
-  queue = Queue()
-  stop_queue = Queue()
-  def reader():
-    stop = False
-    while True:
-      try:
-        stop = stop_queue.get_nowait()
-        time.sleep(empty_sleep)
-      except Empty:
-        pass
-      output = stream.read(1)
-      if not output:
-        if stop:
-          queue.put(b'')
-          break
-        else:
-          time.sleep(empty_sleep)
-          continue
-      try:
-        queue_bytes = queue.get_nowait()
-        queue.task_done()
-        output = queue_bytes + output
-      except Empty:
-        pass
-      queue.put(output)
-      if len(output) >= chunk_size:
-        queue.join()
-
-  thread = Thread(target=reader)
-  thread.setDaemon(True)
-  thread.start()
-
-  return (queue, stop_queue, thread)
+def echo_output(output: bytes):
+  """Writes output bytes directly to the standard output file descriptor, falling back to printing them when standard output has no file descriptor."""
+  try:
+    fd = sys.stdout.fileno()
+  except (AttributeError, io.UnsupportedOperation):
+    print(output.decode(errors='replace'), end='', flush=True)
+    return
+  sys.stdout.flush()
+  view = memoryview(output)
+  while view:
+    view = view[os.write(fd, view):]
 
 def run_process_output(run_args: List[str], shell=False) -> Tuple[int, bytes, bytes]:
   """Runs a process, blocking, and returns a tuple of its return code, output bytes, and error bytes"""
@@ -139,6 +109,7 @@ def run_process(run_args: List[str], terminate_on_exit: bool=True, chunk_size: i
 
   process = subprocess.Popen(run_args, stdout=subprocess.PIPE, stderr=subprocess.PIPE, stdin=subprocess.PIPE)
   terminate = terminator(process=process, terminate_on_exit=terminate_on_exit)
+  delimiter_pattern = re.compile(b'|'.join(re.escape(d) for d in sorted(message_delimiters, key=len, reverse=True))) if message_delimiters else None
 
   def output():
     def handle_input(input_bytes: Optional[Union[bytes, str]]):
@@ -150,73 +121,53 @@ def run_process(run_args: List[str], terminate_on_exit: bool=True, chunk_size: i
       False: b'',
       True: b'',
     }
-    readers = {
-      False: read_stream(stream=process.stdout, chunk_size=chunk_size, empty_sleep=empty_sleep),
-      True: read_stream(stream=process.stderr, chunk_size=chunk_size, empty_sleep=empty_sleep),
-    }
     is_stderr = True
+    decoder = codecs.getincrementaldecoder(encoding)() if encoding else None
     def parse_messages(output_bytes: bytes):
       nonlocal partial_messages
       nonlocal is_stderr
-      messages = [partial_messages[is_stderr] + output_bytes]
-      for delimiter in message_delimiters:
-        messages = [m for o in message_delimiters for m in o.split(delimiter)]
-      partial_messages[is_stderr] = messages[-1]
-      messages = messages[:-1]
-      if encoding:
-        messages = map(lambda m: m.decode(encoding), messages)
+      output_bytes = partial_messages[is_stderr] + output_bytes
+      messages = delimiter_pattern.split(output_bytes) if delimiter_pattern else [output_bytes]
+      partial_messages[is_stderr] = messages.pop()
+      if decoder:
+        messages = [decoder.decode(m, final=True) for m in messages]
       return messages
 
     input_bytes = yield (b'', [], False)
     handle_input(input_bytes)
 
     return_code = None
-    empty_countdown = 2
-    stop_countdown = 2
-    while True:
-      is_stderr = not is_stderr
-      try:
-        output = readers[is_stderr][0].get_nowait()
-        readers[is_stderr][0].task_done()
-        if not output:
-          stop_countdown -= 1
-      except Empty:
-        if return_code is not None and stop_countdown:
-          time.sleep(empty_sleep)
-          continue
-        else:
-          output = b''
-
-      if output == b'':
-        empty_countdown -= 1
-        if empty_countdown:
-          continue
-        time.sleep(empty_sleep)
-        if return_code is None:
+    with selectors.DefaultSelector() as selector:
+      selector.register(process.stdout, selectors.EVENT_READ, False)
+      selector.register(process.stderr, selectors.EVENT_READ, True)
+      while selector.get_map():
+        events = selector.select(timeout=empty_sleep)
+        if not events:
           return_code = process.poll()
-          empty_countdown = 2
           if return_code is not None:
-            for _, reader in readers.items():
-              reader[1].put(True)
+            break
           continue
-        else:    
-          break
-
-      empty_countdown = 2
-    
-      messages = parse_messages(output)
-      if echo:
-        if encoding:
-          if messages:
-            print('\n'.join(messages))
-            sys.stdout.flush()
-        else:
-          string_output = '\n'.join(str(b)[2:-1] for b in output.split(b'\n'))
-          print(string_output, end='')
-          sys.stdout.flush()
-
-      input_bytes = yield (output, message_delimiters, is_stderr)
-      handle_input(input_bytes)
+
+        for key, _ in events:
+          is_stderr = key.data
+          output = os.read(key.fd, chunk_size)
+          if not output:
+            selector.unregister(key.fileobj)
+            continue
+
+          messages = parse_messages(output)
+          if echo:
+            if encoding:
+              if messages:
+                echo_output(b'\n'.join(m.encode(encoding) for m in messages) + b'\n')
+            else:
+              echo_output(output)
+
+          input_bytes = yield (output, messages, is_stderr)
+          handle_input(input_bytes)
+
+    if return_code is None:
+      return_code = process.wait()
 
     if terminate_on_exit:
       atexit.unregister(terminate)
@@ -224,14 +175,14 @@ def run_process(run_args: List[str], terminate_on_exit: bool=True, chunk_size: i
     for is_stderr in (False, True):
       if partial_messages[is_stderr] == b'':
         continue
-      last_messages = [partial_messages[is_stderr].decode(encoding)] if encoding else [partial_messages[is_stderr]]
+      last_messages = [decoder.decode(partial_messages[is_stderr], final=True)] if decoder else [partial_messages[is_stderr]]
       yield (b'', last_messages, is_stderr)
 
     return return_code
 
   return (process, terminate, output())
 
-def run_process_combined(run_args: List[str], on_output: Optional[Callable[[subprocess.Popen, str, bytes], Optional[bytes]]]=None, echo: bool=False) -> Tuple[int, str, bytes]:
+def run_process_combined(run_args: List[str], on_output: Optional[Callable[[subprocess.Popen, str, bytes], Optional[bytes]]]=None, echo: bool=False, chunk_size: int=1024) -> Tuple[int, str, bytes]:
   """Runs a subprocess, without blocking, supports two-way interaction, and combines then stdout and stderr streams.
 
   This function is a simpler implementation of run_process() at the cost of combining stdout and stderr.
@@ -240,32 +191,31 @@ def run_process_combined(run_args: List[str], on_output: Optional[Callable[[subp
     tuple: a tuple containing the return code, the combined collected output string and the combined collected output bytes.
   """
   process = subprocess.Popen(run_args, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, stdin=subprocess.PIPE)
-  collected_bytes = b''
-  collected_output = ''
+  collected_bytes = bytearray()
+  collected_output = io.StringIO()
+  decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
 
   while True:
-    output = process.stdout.read(1)
+    output = process.stdout.read1(chunk_size)
 
     if output == b'':
-      if process.poll() is not None:
-        break
-      else:
-        continue
+      break
 
-    collected_bytes += output
-    string_output = '\n' if output == b'\n' else str(output)[2:-1]
-    collected_output += string_output
+    collected_bytes.extend(output)
+    string_output = decoder.decode(output)
+    collected_output.write(string_output)
     if echo:
       print(string_output, end='')
       sys.stdout.flush()
 
     if on_output:
-      input_bytes = on_output(process, collected_output, collected_bytes)
+      input_bytes = on_output(process, collected_output.getvalue(), bytes(collected_bytes))
       if input_bytes is not None:
         process.stdin.write(input_bytes)
         process.stdin.flush()
         if echo:
           print(str(input_bytes)[2:-1], end='')
 
-  return_code = process.poll()
-  return (return_code, collected_output, collected_bytes)
\ No newline at end of file
+  collected_output.write(decoder.decode(b'', final=True))
+  return_code = process.wait()
+  return (return_code, collected_output.getvalue(), bytes(collected_bytes))
@@ -0,0 +1,19 @@
+import pytest
+import linecache
+import traceback
+
+from moda import evaluate as evaluate_module
+from moda.evaluate import evaluate
+
+def test_evaluate_traceback_shows_source():
+  with pytest.raises(ValueError) as error:
+    evaluate('x = 1\nraise ValueError(x)')
+  assert 'raise ValueError(x)' in ''.join(traceback.format_exception(error.type, error.value, error.tb))
+
+def test_evaluate_bounds_cached_sources(monkeypatch):
+  monkeypatch.setattr(evaluate_module, '_evaluated_source_limit', 3)
+  for i in range(10):
+    evaluate(f'x = {i}')
+  cached = [n for n in linecache.cache if n.startswith('<moda-eval-')]
+  assert len(cached) == 3
+  assert evaluate('y = 9')['y'] == 9
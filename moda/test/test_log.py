@@ -0,0 +1,32 @@
+import os
+import tracemalloc
+import pandas as pd
+
+from moda.log import log_memory_usage, current_process
+
+def test_log_memory_usage_keeps_dataframe_creation_working(tmp_path, monkeypatch):
+  monkeypatch.chdir(tmp_path)
+  log_memory_usage('test')
+  df = pd.DataFrame({'x': range(10)})
+  assert len(df[df.x > 4]) == 5
+
+def test_log_memory_usage_counts_existing_dataframes(tmp_path, monkeypatch, capsys):
+  monkeypatch.chdir(tmp_path)
+  df = pd.DataFrame({'existing_column': range(3)})
+  log_memory_usage('test')
+  totals = next(l for l in capsys.readouterr().out.splitlines() if l.startswith('DataFrames: '))
+  total, rows = (int(w) for w in totals.split() if w.isdigit())
+  assert total >= 1
+  assert rows >= len(df)
+  log_memory_usage('test', verbose=True)
+  assert 'existing_column' in capsys.readouterr().out
+
+def test_current_process_follows_pid(monkeypatch):
+  assert current_process().pid == os.getpid()
+  monkeypatch.setattr(os, 'getpid', lambda: os.getppid())
+  assert current_process().pid == os.getppid()
+
+def test_log_memory_usage_does_not_start_tracing(tmp_path, monkeypatch):
+  monkeypatch.chdir(tmp_path)
+  log_memory_usage('test')
+  assert not tracemalloc.is_tracing()
@@ -0,0 +1,51 @@
+import pandas as pd
+
+from moda.user import UserInteractor, _compile_cache
+
+def test_present_report_aligns_chunked_rows(capsys):
+  report = pd.DataFrame({'a': range(25), 'value': [x * 1000 for x in range(25)], 'ratio': [x / 8 for x in range(25)]})
+  UserInteractor(interactive=False).present_report(report, chunk_size=10)
+  lines = [l for l in capsys.readouterr().out.splitlines() if l]
+  assert len(lines) == 26
+  assert len({len(l) for l in lines}) == 1
+
+def test_present_report_streams_series_without_header(capsys):
+  report = pd.Series([x * 1000 for x in range(25)], name='value')
+  UserInteractor(interactive=False).present_report(report, chunk_size=10)
+  lines = [l for l in capsys.readouterr().out.splitlines() if l]
+  assert len(lines) == 25
+  assert len({len(l) for l in lines}) == 1
+  assert lines == report.to_string().splitlines()
+
+def test_present_report_prints_index_name_once(capsys):
+  report = pd.DataFrame({'a': range(25)}, index=pd.Index(range(25), name='idx'))
+  UserInteractor(interactive=False).present_report(report, chunk_size=10)
+  lines = [l for l in capsys.readouterr().out.splitlines() if l]
+  assert len(lines) == 27
+  assert len([l for l in lines if l.startswith('idx')]) == 1
+  assert len({len(l) for l in lines}) == 1
+
+def test_present_report_formats_floats_alike_across_chunks(capsys):
+  report = pd.DataFrame({'f': [0.5, 0.25, 1e-10, 2e-10, 0.5]})
+  UserInteractor(interactive=False).present_report(report, chunk_size=2)
+  lines = [l for l in capsys.readouterr().out.splitlines() if l]
+  assert len(lines) == 6
+  assert len({len(l) for l in lines}) == 1
+  assert lines[1].endswith('5.000000e-01')
+
+def test_present_report_chunks_multi_index(capsys):
+  index = pd.MultiIndex.from_product([['a', 'bbb'], range(15)], names=['key', 'number'])
+  report = pd.DataFrame({'value': range(30)}, index=index)
+  UserInteractor(interactive=False).present_report(report, chunk_size=10)
+  lines = [l for l in capsys.readouterr().out.splitlines() if l]
+  assert len(lines) == 32
+  assert len({len(l) for l in lines}) == 1
+
+def test_run_code_keeps_latest_compiled_script_per_path(capsys):
+  user = UserInteractor(interactive=False)
+  user.run_code(code='x = 1', file_path='script.py', description='test', confirm=False)
+  user.run_code(code='x = 2', file_path='script.py', description='test', confirm=False)
+  code, compiled = _compile_cache['script.py']
+  assert code == 'x = 2'
+  user.run_code(code='x = 2', file_path='script.py', description='test', confirm=False)
+  assert _compile_cache['script.py'][1] is compiled
@@ -1,7 +1,5 @@
 import os
-import re
-import pdb
-import code
+import sys
 import glob
 import time
 import click
@@ -9,18 +7,39 @@ import signal
 import logging
 import collections
 import subprocess
-import IPython
-import bpython
+import numpy as np
 import pandas as pd
 
 from enum import Enum
+from types import CodeType
 from datetime import datetime
 from pprint import pformat
-from typing import List, Optional, Callable, Dict, Union
+from typing import List, Optional, Callable, Dict, Union, Tuple
 from .style import Styled, CustomStyled, CodeStyled, Format
 from .error import ModaTimeoutError, ModaCannotInteractError
 from pathlib import Path
 
+_compile_cache: Dict[str, Tuple[str, CodeType]] = {}
+
+def _handle_alarm(signum, frame):
+  raise ModaTimeoutError()
+
+def _report_formatter(values: pd.Series) -> Optional[Callable[[any], str]]:
+  """Picks one format for a float or datetime report column so that every chunk renders it alike."""
+  if pd.api.types.is_datetime64_dtype(values):
+    dates = values.dropna()
+    return (lambda x: str(x)[:10]) if (dates == dates.dt.normalize()).all() else str
+  if not pd.api.types.is_float_dtype(values):
+    return None
+  precision = pd.get_option('display.precision')
+  finite = values.dropna().astype(float)
+  finite = finite[np.isfinite(finite)].abs()
+  if ((finite > 1e6) | ((finite < 10 ** -precision) & (finite > 0))).any():
+    return lambda x: f'{x:.{precision}e}'
+  rounded = finite.round(precision)
+  decimals = next((d for d in range(1, precision) if (finite.round(d) == rounded).all()), precision)
+  return lambda x: f'{x:.{decimals}f}'
+
 class MenuOption(Enum):
   @property
   def option_text(self) -> str:
@@ -52,15 +71,31 @@ class Interaction(MenuOption):
   def styled(self) -> Styled:
     return CustomStyled(text=self.option_text, style=Format().blue())
 
-class Console(code.InteractiveConsole):
-  record: List = None
+_console_class: Optional[type] = None
+
+def console_class() -> type:
+  """Builds the recording console class on first use so that the code module is only imported when a default shell is opened."""
+  global _console_class
+  if _console_class is None:
+    import code
+
+    class Console(code.InteractiveConsole):
+      record: List = None
+
+      def raw_input(self, prompt=''):
+        result = super().raw_input(prompt=prompt)
+        if self.record is None:
+          self.record = []
+        self.record.append(result)
+        return result
+
+    _console_class = Console
+  return _console_class
 
-  def raw_input(self, prompt=''):
-    result = super().raw_input(prompt=prompt)
-    if self.record is None:
-      self.record = []
-    self.record.append(result)
-    return result
+def __getattr__(name: str) -> any:
+  if name == 'Console':
+    return console_class()
+  raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
 
 class UserExceptionFormatter(logging.Formatter):
   style: Format = Format().red().bold()
@@ -88,6 +123,7 @@ class UserInteractor:
   script_directory_components: List[str]
   output_directory_components: List[str]
   _last_script_name: Optional[str]=None
+  _safe_file_name_table: Dict[int, str] = str.maketrans({'/': '_', ':': '_'})
 
   def __init__(self, locals: Dict[str, any]={}, timeout: Optional[int]=30, interactive: bool=True, quiet: bool=False, python_shell_type: PythonShellType=PythonShellType.ipython, editor_command: List[str]=['vi'], script_directory_components: List[str]=['output', 'python', 'scripts'], output_directory_components: List[str]=['output', 'python']):
     self.timeout = timeout
@@ -111,7 +147,7 @@ class UserInteractor:
     
   @classmethod
   def safe_file_name(cls, name: str) -> str:
-    return re.sub(r'[/:]', '_', name)
+    return name.translate(cls._safe_file_name_table)
 
   @property
   def python_locals(self) -> Dict[str, any]:
@@ -128,20 +164,21 @@ class UserInteractor:
       elif self.timeout <= 0:
         response = default_response
       else:
-        def handle_alarm(signum, frame):
-          raise ModaTimeoutError()
         original_handler = signal.getsignal(signal.SIGALRM)
-        signal.signal(signal.SIGALRM, handle_alarm)
-        original_time = time.time()
+        if original_handler is not _handle_alarm:
+          signal.signal(signal.SIGALRM, _handle_alarm)
         original_alarm = signal.alarm(self.timeout)
+        original_time = time.time() if original_alarm else None
         try:
           print(f'Will continue automaticially after {self.timeout} seconds with reponse [{default_response}]')
           response = prompter(prompt, response_type, default_response)
-          signal.alarm(0)
         except ModaTimeoutError:
           print(f' => {default_response} (continuing automaticially after {self.timeout} seconds)')
           response = default_response
-        signal.signal(signal.SIGALRM, original_handler)
+        finally:
+          signal.alarm(0)
+        if original_handler not in (_handle_alarm, signal.SIG_DFL):
+          signal.signal(signal.SIGALRM, original_handler)
         if original_alarm:
           new_alarm = original_alarm - (time.time() - original_time)
           if new_alarm > 0:
@@ -178,7 +215,41 @@ class UserInteractor:
       return click.confirm(prompt, default=default_response)
     return self.present_prompt(prompt=prompt, response_type=bool, default_response=default_response, prompter=prompter)
 
-  def present_report(self, report: Union[pd.DataFrame, pd.Series], title: Optional[str]=None, prefix: Optional[str]=None, suffix: Optional[str]=None):
+  def present_report(self, report: Union[pd.DataFrame, pd.Series], title: Optional[str]=None, prefix: Optional[str]=None, suffix: Optional[str]=None, chunk_size: int=10000):
+    if len(report) > chunk_size:
+      self.present_title(title=title)
+      if self.quiet:
+        return
+      is_series = isinstance(report, pd.Series)
+      frame = report.to_frame() if is_series else report
+      formatters = [_report_formatter(v) for _, v in frame.items()]
+      col_space = {c: 0 if is_series else max(len(str(l)) for l in (c if isinstance(c, tuple) else [c])) for c in frame.columns}
+      col_space[''] = max((len(str(n)) for n in frame.index.names if n is not None), default=0)
+      for start in range(0, len(frame), chunk_size):
+        chunk = frame.iloc[start:start + chunk_size]
+        for (c, v), formatter in zip(chunk.items(), formatters):
+          col_space[c] = max(col_space[c], int(v.astype(object).map(formatter or str, na_action='ignore').fillna('NaN').str.len().max()) + 1)
+        for level in range(chunk.index.nlevels):
+          col_space[''] = max(col_space[''], int(chunk.index.get_level_values(level).map(str).str.len().max()))
+      if is_series:
+        col_space[frame.columns[0]] += 2
+      with pd.option_context('display.max_columns', None):
+        if prefix:
+          print(prefix)
+        for start in range(0, len(frame), chunk_size):
+          chunk = frame.iloc[start:start + chunk_size]
+          if start:
+            chunk = chunk.rename_axis([None] * chunk.index.nlevels)
+          if is_series or not start:
+            chunk.to_string(buf=sys.stdout, header=not is_series, col_space=col_space, formatters=formatters)
+          else:
+            # Rendering with the header keeps pandas' column spacing identical to the first chunk.
+            chunk_text = chunk.to_string(col_space=col_space, formatters=formatters)
+            sys.stdout.write(chunk_text.split('\n', frame.columns.nlevels)[-1])
+          sys.stdout.write('\n')
+        if suffix:
+          print(suffix)
+      return
     with pd.option_context('display.max_rows', None, 'display.max_columns', None):
       prefix = f'{prefix}\n' if prefix else ''
       report_text = report.to_string() if not report.empty else 'Empty report.'
@@ -221,10 +292,11 @@ class UserInteractor:
     for name, value in self.locals.items():
       print(f'  {name}:\n    {pformat(value)}')
     if self.python_shell_type is PythonShellType.default:
-      console = Console(locals=self.locals)
+      console = console_class()(locals=self.locals)
       console.interact(banner='Python shell. Type CTRL-D to exit.')
       return '\n'.join(console.record)
     elif self.python_shell_type is PythonShellType.ipython:
+      import IPython
       print('IPython shell. Type CTRL-D to exit.')
       console = IPython.terminal.embed.InteractiveShellEmbed()
       import builtins
@@ -236,6 +308,7 @@ class UserInteractor:
           record += f'# {str(console.history_manager.output_hist[index])}\n'
       return record
     elif self.python_shell_type is PythonShellType.bpython:
+      import bpython
       history_path = os.path.join(*self.output_directory_components, 'history.py')
       try:
         os.remove(history_path)
@@ -292,20 +365,27 @@ class UserInteractor:
       self.script_directory_components = previous_script_directory_components
 
   def run_script(self, script_name: Optional[str]=None):
-    script_paths = glob.glob(os.path.join(*self.script_directory_components, '*.py'))
-    if not script_paths:
-      print(f'No scripts found in \'{os.path.join(self.script_directory_components)}/\'')
-      return
-    script_names = {os.path.splitext(os.path.basename(p))[0]: p for p in script_paths}
-    if script_name is None and self.interactive:
-      default_script = self._last_script_name if self._last_script_name in script_names.keys() else None
-      script_name = click.prompt('Enter a script to execute', type=click.Choice(sorted(script_names.keys())), default=default_script)
-    if not script_name:
-      return
+    if script_name is not None:
+      script_path = os.path.join(*self.script_directory_components, f'{script_name}.py')
+      if not os.path.isfile(script_path):
+        print(f'No script found at \'{script_path}\'')
+        return
+    else:
+      script_paths = glob.glob(os.path.join(*self.script_directory_components, '*.py'))
+      if not script_paths:
+        print(f'No scripts found in \'{os.path.join(*self.script_directory_components)}/\'')
+        return
+      script_names = {os.path.splitext(os.path.basename(p))[0]: p for p in script_paths}
+      if self.interactive:
+        default_script = self._last_script_name if self._last_script_name in script_names.keys() else None
+        script_name = click.prompt('Enter a script to execute', type=click.Choice(sorted(script_names.keys())), default=default_script)
+      if not script_name:
+        return
+      script_path = script_names[script_name]
     self._last_script_name = script_name
-    with open(script_names[script_name], 'r') as f:
+    with open(script_path, 'r') as f:
       script = f.read()
-    self.run_code(code=script, file_path=script_names[script_name], description=f'from \'{script_names[script_name]}\'')
+    self.run_code(code=script, file_path=script_path, description=f'from \'{script_path}\'')
 
   def run_code(self, code: str, file_path: str, description: str, confirm: Optional[bool]=True):
     if confirm:
@@ -313,12 +393,16 @@ class UserInteractor:
       prompt = CustomStyled(text=f'Script...\n{"–" * 9}\n', style=message_style) + CodeStyled(text=code) + CustomStyled(text=f'{"–" * 9}\n...Script\n', style=message_style) + f'Run this script ({description})'
       if not self.present_confirmation(prompt=prompt.styled, default_response=True):
         return
-    compiled = compile(code, file_path, 'exec')
+    cached_code, compiled = _compile_cache.get(file_path, (None, None))
+    if cached_code != code:
+      compiled = compile(code, file_path, 'exec')
+      _compile_cache[file_path] = (code, compiled)
     namespace = {**self.locals}
     exec(compiled, namespace, namespace)
     print(f'Ran script ({description})')    
 
   def debug(self):
+    import pdb
     pdb.set_trace()
 
   def present_title(self, title: str=''):
@@ -332,13 +416,18 @@ class UserInteractor:
     attempt_style = Format().blue()
     error_style = Format().red().bold()
     result_style = Format().green().bold()
-    for index, row in log.iterrows():
+    error_template = error_style('  = {} – {}')
+    result_template = result_style('  = {} : {}')
+    attempt_template = attempt_style('  = {}')
+    lines = []
+    for row in log.itertuples():
       mission = f'{row.mission}.' if row.mission else ''
-      print(f'{index_style(str(index))} {mission}{maneuver_style(row.maneuver)}')
+      lines.append(f'{index_style(str(row.Index))} {mission}{maneuver_style(row.maneuver)}')
       if row.error:
-        print(error_style(f'  = {row.option} – {row.error}'))
+        lines.append(error_template.format(row.option, row.error))
       elif row.result:
-        print(result_style(f'  = {row.option} : {row.result}'))
-      else: 
-        print(attempt_style(f'  = {row.option}'))
-    print(f'{len(log)} actions logged')
+        lines.append(result_template.format(row.option, row.result))
+      else:
+        lines.append(attempt_template.format(row.option))
+    lines.append(f'{len(log)} actions logged')
+    sys.stdout.write('\n'.join(lines) + '\n')
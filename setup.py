@@ -8,6 +8,7 @@ setup(name='moda',
       author_email='gklei89@gmail.com',
       license='MIT',
       packages=find_packages(),
+      python_requires='>=3.8',
       install_requires=[
         'pytest',
         'click',